@@ -0,0 +1,142 @@
+import asyncio
+from itertools import count, islice
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import webservices_scraping as ws
+
+
+async def _serve(handler):
+    app = web.Application()
+    app.router.add_route('*', '/{tail:.*}', handler)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+def test_api_regex_prefers_versioned_endpoint():
+    collector = ws.APICollector()
+
+    assert collector._api_regex.findall('see https://api.foo.com/v1 or https://api.bar.io') == [
+        'https://api.foo.com/v1', 'https://api.bar.io'
+    ]
+
+
+def test_extract_links_from_html_keeps_only_api_urls():
+    collector = ws.APICollector()
+    html = '<a href="/api/users">u</a><a href="/about">a</a><a href="https://x.com/contact">c</a>'
+
+    assert set(collector.extract_links_from_html(html, 'http://h/dir')) == {'http://h/api/users'}
+
+
+def test_extract_links_from_html_falls_back_when_lxml_rejects_the_page():
+    collector = ws.APICollector()
+    xml_declared = '<?xml version="1.0" encoding="utf-8"?><html><a href="/api/x">x</a></html>'
+
+    assert set(collector.extract_links_from_html(xml_declared, 'http://h/')) == {'http://h/api/x'}
+    assert set(collector.extract_links_from_html('<!-- vide -->', 'http://h/')) == set()
+    assert set(collector.extract_links_from_html('   ', 'http://h/')) == set()
+
+
+def test_api_regex_stops_at_markdown_link_delimiters():
+    collector = ws.APICollector()
+
+    assert collector._api_regex_bytes.findall(b'[https://api.example.com](https://api.example.com)') == [
+        b'https://api.example.com', b'https://api.example.com'
+    ]
+
+
+def test_extract_links_from_html_unescapes_regex_hits():
+    collector = ws.APICollector()
+
+    links = set(collector.extract_links_from_html('<p>https://api.x.com?a=1&amp;b=2</p>', 'http://h/'))
+
+    assert links == {'https://api.x.com?a=1&b=2'}
+
+
+def test_slow_endpoints_on_one_host_are_all_functional():
+    """Les URLs en attente du plafond par hôte ne doivent pas consommer leur timeout"""
+    state = {'current': 0, 'max': 0}
+
+    async def slow(request):
+        state['current'] += 1
+        state['max'] = max(state['max'], state['current'])
+        await asyncio.sleep(1.5)
+        state['current'] -= 1
+        return web.json_response({})
+
+    async def run():
+        server = await _serve(slow)
+        try:
+            collector = ws.APICollector()
+            urls = [str(server.make_url(f'/api/{i}')) for i in range(20)]
+            async with collector.create_session() as session:
+                return await collector.test_apis(session, urls)
+        finally:
+            await server.close()
+
+    functional = asyncio.run(run())
+
+    assert len(functional) == 20
+    assert state['max'] <= ws.LIMIT_PER_HOST
+
+
+def test_interleave_by_host_round_robin():
+    urls = ['http://a/1', 'http://a/2', 'http://a/3', 'http://b/1', 'http://c/1', 'http://b/2']
+
+    assert list(ws.interleave_by_host(urls)) == [
+        'http://a/1', 'http://b/1', 'http://c/1', 'http://a/2', 'http://b/2', 'http://a/3'
+    ]
+
+
+def test_interleave_by_host_is_lazy():
+    urls = (f'http://h{i % 3}/api/{i}' for i in count())
+
+    assert len(list(islice(ws.interleave_by_host(urls), 10))) == 10
+
+
+def test_response_time_excludes_retry_after_wait():
+    calls = {'n': 0}
+
+    async def limited_once(request):
+        calls['n'] += 1
+        if calls['n'] == 1:
+            return web.Response(status=429, headers={'Retry-After': '1'})
+        return web.json_response({})
+
+    async def run():
+        server = await _serve(limited_once)
+        try:
+            collector = ws.APICollector()
+            async with collector.create_session() as session:
+                return await collector.test_api_endpoint(session, str(server.make_url('/api')))
+        finally:
+            await server.close()
+
+    result = asyncio.run(run())
+
+    assert result.is_functional
+    assert result.rate_limited
+    assert result.response_time < 0.5
+
+
+def test_malformed_url_does_not_abort_test_apis():
+    malformed = 'https://api.example.com](https:'
+
+    async def ok(request):
+        return web.json_response({})
+
+    async def run():
+        server = await _serve(ok)
+        try:
+            collector = ws.APICollector()
+            async with collector.create_session() as session:
+                return await collector.test_apis(session, [malformed, str(server.make_url('/api'))])
+        finally:
+            await server.close()
+
+    functional = asyncio.run(run())
+
+    assert malformed in list(ws.interleave_by_host([malformed]))
+    assert [api.url.endswith('/api') for api in functional] == [True]
@@ -4,17 +4,62 @@ Script de collecte d'APIs et webservices fonctionnels depuis Internet
 Auteur: Assistant Claude
 """
 
-import requests
+import aiohttp
+from aiohttp import hdrs
+import asyncio
 from bs4 import BeautifulSoup
-import json
+import orjson
 import csv
 import time
-import random
 import re
+import html
+from collections import defaultdict
+from dataclasses import dataclass, fields
+from functools import partial
+from operator import attrgetter, itemgetter
+from itertools import chain, islice, zip_longest
 from urllib.parse import urljoin, urlparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 
+try:
+    import aiodns  # noqa: F401  (résolution DNS asynchrone si disponible)
+    HAS_AIODNS = True
+except ImportError:
+    HAS_AIODNS = False
+
+try:
+    from lxml import etree, html as lxml_html  # parseur HTML et XPath en C, bien plus rapide
+except ImportError:
+    etree = lxml_html = None
+
+# Pool de connexions et nouvelles tentatives sur erreurs transitoires
+POOL_SIZE = 256
+LIMIT_PER_HOST = 4
+INTERLEAVE_WINDOW = 1024
+DNS_CACHE_TTL = 300
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.3
+MAX_RETRY_AFTER = 10
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# Indicateurs d'URL d'API, compilés une seule fois
+API_INDICATORS = frozenset({
+    'api', 'rest', 'graphql', 'webhook', 'endpoint',
+    '/v1/', '/v2/', '/v3/', '.json', '.xml'
+})
+API_INDICATOR_RE = re.compile('|'.join(map(re.escape, API_INDICATORS)), re.IGNORECASE)
+GRAPHQL_RE = re.compile('graphql', re.IGNORECASE)
+
+# Blocs <script>/<style> retirés avant de chercher des URLs dans le HTML brut
+SCRIPT_STYLE_RE = re.compile(r'<(script|style)[^>]*>.*?</\1>', re.DOTALL | re.IGNORECASE)
+
+# Type d'API déduit du content-type (premier sous-texte trouvé)
+TYPE_BY_SUBSTR = (('json', 'REST/JSON'), ('xml', 'REST/XML'))
+
+# API GitHub : README en texte brut et nombre limité de requêtes simultanées
+GITHUB_RAW_HEADERS = {'Accept': 'application/vnd.github.raw'}
+GITHUB_CONCURRENCY = 10
+
 # Configuration du logging
 logging.basicConfig(
     level=logging.INFO,
@@ -26,12 +71,81 @@ logging.basicConfig(
 )
 
 
+def host_key(url):
+    """Hôte d'une URL ; '' si l'URL est mal formée (elle sera rejetée au moment du test)"""
+    try:
+        return urlparse(url).netloc
+    except ValueError:
+        return ''
+
+
+def interleave_by_host(urls, window=INTERLEAVE_WINDOW):
+    """Répartit les URLs en tourniquet par hôte, fenêtre par fenêtre pour rester paresseux"""
+    urls = iter(urls)
+    while chunk := list(islice(urls, window)):
+        by_host = {}
+        for url in chunk:
+            by_host.setdefault(host_key(url), []).append(url)
+
+        for batch in zip_longest(*by_host.values()):
+            yield from filter(None, batch)
+
+
+@dataclass(slots=True)
+class ApiInfo:
+    """Résultat du test d'un endpoint (slots : bien plus léger qu'un dict par URL)"""
+    url: str
+    status_code: int
+    content_type: str = ''
+    server: str = ''
+    is_functional: bool = False
+    response_time: float = 0.0
+    supports_cors: bool = False
+    requires_auth: bool = False
+    rate_limited: bool = False
+    type: str = 'Unknown'
+    error: str = ''
+
+
+# Colonnes des résultats et extraction d'une ligne CSV en un seul appel C
+RESULT_FIELDS = tuple(f.name for f in fields(ApiInfo))
+result_row = attrgetter(*RESULT_FIELDS)
+
+
+class ResultWriter:
+    """Écrit les APIs fonctionnelles au fil de l'eau, en JSONL et en CSV"""
+
+    def __init__(self, basename):
+        self.json_file = f"{basename}.jsonl"
+        self.csv_file = f"{basename}.csv"
+
+    def __enter__(self):
+        self._json_fp = open(self.json_file, 'wb')
+        self._csv_fp = open(self.csv_file, 'w', newline='', encoding='utf-8')
+        self._csv_writer = csv.writer(self._csv_fp)
+        self._csv_writer.writerow(RESULT_FIELDS)
+        return self
+
+    def write(self, api):
+        """Ajoute une API aux deux fichiers (une ligne chacun)"""
+        self._json_fp.write(orjson.dumps(api, option=orjson.OPT_APPEND_NEWLINE))
+        self._csv_writer.writerow(result_row(api))
+        # Vider les tampons : un arrêt brutal ne perd pas les résultats déjà trouvés
+        self._json_fp.flush()
+        self._csv_fp.flush()
+
+    def __exit__(self, exc_type, exc, tb):
+        self._json_fp.close()
+        self._csv_fp.close()
+
+
 class APICollector:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+    def __init__(self, max_concurrency=200):
+        # Nombre de tests HTTP simultanés (charge purement I/O)
+        self.max_concurrency = max_concurrency
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        }
 
         # Sites connus pour lister des APIs
         self.api_directories = [
@@ -43,103 +157,150 @@ class APICollector:
             'https://www.programmableweb.com/apis/directory'
         ]
 
-        # Patterns pour identifier les APIs
+        # Patterns pour identifier les APIs (guillemets, chevrons, crochets et parenthèses exclus :
+        # ils délimitent les URLs dans le HTML et dans les liens Markdown des README).
+        # Les patterns avec chemin passent en premier : l'alternation fusionnée ne garde que la première
+        # branche qui correspond, et https://api.foo.com/v1 doit donner l'endpoint versionné, pas l'hôte seul.
         self.api_patterns = [
-            r'https?://[^/\s]+/api',
-            r'https?://api\.[^/\s]+',
-            r'https?://[^/\s]+\.api\.',
-            r'https?://[^/\s]+/v\d+',
-            r'https?://[^/\s]+/rest',
-            r'https?://[^/\s]+/graphql'
+            r"https?://[^/\s\"'<>()\[\]]+/api",
+            r"https?://[^/\s\"'<>()\[\]]+/v\d+",
+            r"https?://[^/\s\"'<>()\[\]]+/rest",
+            r"https?://[^/\s\"'<>()\[\]]+/graphql",
+            r"https?://api\.[^/\s\"'<>()\[\]]+",
+            r"https?://[^/\s\"'<>()\[\]]+\.api\."
         ]
+        # Un seul passage sur le texte au lieu d'un re.findall par pattern
+        self._api_regex = re.compile('|'.join(f'(?:{p})' for p in self.api_patterns), re.IGNORECASE)
+        # Même regex sur des octets, pour scanner les README sans les décoder
+        self._api_regex_bytes = re.compile(self._api_regex.pattern.encode(), re.IGNORECASE)
 
-        self.found_apis = []
+        self.found_apis = set()
         self.tested_apis = []
 
-    def get_page_content(self, url, timeout=10):
+    def create_session(self):
+        """Crée la session HTTP asynchrone partagée par toutes les requêtes"""
+        # Pool large : les sockets restent ouverts et réutilisés d'un test à l'autre, DNS mis en cache par hôte.
+        # Le plafond par hôte est appliqué dans test_apis, avant le démarrage du timeout de chaque test.
+        connector = aiohttp.TCPConnector(
+            limit=max(POOL_SIZE, self.max_concurrency),
+            use_dns_cache=True,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            resolver=aiohttp.AsyncResolver() if HAS_AIODNS else None
+        )
+        return aiohttp.ClientSession(headers=self.headers, connector=connector)
+
+    async def get_page_content(self, session, url, timeout=10):
         """Récupère le contenu d'une page web"""
         try:
-            response = self.session.get(url, timeout=timeout)
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                response.raise_for_status()
+                # Pas d'exception sur un charset absent ou erroné (latin-1 servi sans en-tête...)
+                return await response.text(errors='replace')
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logging.warning(f"Erreur lors de la récupération de {url}: {e}")
             return None
 
-    def extract_links_from_html(self, html_content, base_url):
-        """Extrait tous les liens d'une page HTML"""
+    def _extract_hrefs(self, html_content, base_url):
+        """Extrait tous les liens href absolus d'une page HTML"""
+        if lxml_html is not None:
+            try:
+                # Résolution des liens relatifs et XPath en C
+                doc = lxml_html.fromstring(html_content)
+                doc.make_links_absolute(base_url, resolve_base_href=True, handle_failures='discard')
+                return doc.xpath('//a/@href', smart_strings=False)
+            except (ValueError, etree.ParserError):
+                # Déclaration XML avec encodage, document vide... : repli sur BeautifulSoup
+                pass
+
         soup = BeautifulSoup(html_content, 'html.parser')
-        links = []
+        # Boucles déléguées à map() en C : pas de frame Python ni d'indexation de Tag par lien
+        tags = soup.find_all('a', href=True)
+        return map(partial(urljoin, base_url), map(itemgetter('href'), map(attrgetter('attrs'), tags)))
 
-        # Extraire tous les liens href
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            full_url = urljoin(base_url, href)
-            links.append(full_url)
+    def extract_links_from_html(self, html_content, base_url):
+        """Extrait les liens d'API d'une page HTML (itérateur, doublons possibles)"""
+        hrefs = self._extract_hrefs(html_content, base_url)
 
-        # Extraire les URLs depuis le texte (regex)
-        text_content = soup.get_text()
-        for pattern in self.api_patterns:
-            matches = re.findall(pattern, text_content, re.IGNORECASE)
-            links.extend(matches)
+        # Extraire les URLs d'APIs directement du HTML brut, sans reparcourir l'arbre pour en extraire le texte
+        # (entités décodées : https://api.x.com?a=1&amp;b=2 doit être testée telle que le navigateur la voit)
+        regex_hits = map(html.unescape, self._api_regex.findall(SCRIPT_STYLE_RE.sub('', html_content)))
 
-        return list(set(links))  # Supprimer les doublons
+        # Filtrer dès l'extraction : seuls les liens ressemblant à une API sont produits
+        return filter(self.is_api_url, chain(hrefs, regex_hits))
 
     def is_api_url(self, url):
         """Vérifie si une URL ressemble à une API"""
-        url_lower = url.lower()
-        api_indicators = [
-            'api', 'rest', 'graphql', 'webhook', 'endpoint',
-            '/v1/', '/v2/', '/v3/', '.json', '.xml'
-        ]
-
-        return any(indicator in url_lower for indicator in api_indicators)
-
-    def test_api_endpoint(self, url, timeout=5):
+        return bool(API_INDICATOR_RE.search(url))
+
+    async def _request_status(self, session, url, timeout):
+        """Envoie un GET et renvoie (statut, en-têtes, limité par 429, durée de la dernière tentative)"""
+        rate_limited = False
+        for attempt in range(MAX_RETRIES + 1):
+            # Seuls la ligne de statut et les en-têtes sont lus, le corps n'est jamais consommé
+            start = time.perf_counter()
+            async with session.get(url, timeout=timeout, allow_redirects=True) as response:
+                elapsed = time.perf_counter() - start
+                status = response.status
+                rate_limited = rate_limited or status == 429
+                if status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    return status, response.headers, rate_limited, elapsed
+                retry_after = response.headers.get(hdrs.RETRY_AFTER, '')
+
+            # Erreur transitoire ou limitation : réessayer, en respectant Retry-After s'il est fourni
+            delay = RETRY_BACKOFF * 2 ** attempt
+            if retry_after.isdigit():
+                delay = min(int(retry_after), MAX_RETRY_AFTER)
+            await asyncio.sleep(delay)
+
+    async def test_api_endpoint(self, session, url, timeout=5):
         """Teste si un endpoint API est fonctionnel"""
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
         try:
-            # Tester d'abord avec HEAD pour économiser la bande passante
-            response = self.session.head(url, timeout=timeout, allow_redirects=True)
-
-            # Si HEAD échoue, essayer GET
-            if response.status_code >= 400:
-                response = self.session.get(url, timeout=timeout)
+            # Un seul GET : beaucoup d'APIs refusent HEAD (405), ce qui coûtait un second aller-retour
+            status, h, rate_limited, response_time = await self._request_status(session, url, client_timeout)
 
-            # Analyser la réponse
-            api_info = {
-                'url': url,
-                'status_code': response.status_code,
-                'content_type': response.headers.get('content-type', ''),
-                'server': response.headers.get('server', ''),
-                'is_functional': response.status_code < 400,
-                'response_time': response.elapsed.total_seconds(),
-                'supports_cors': 'access-control-allow-origin' in response.headers,
-                'requires_auth': response.status_code == 401,
-                'rate_limited': response.status_code == 429
-            }
+            # Lire chaque en-tête une seule fois (clés istr pré-calculées d'aiohttp)
+            ct = h.get(hdrs.CONTENT_TYPE, '')
+            srv = h.get(hdrs.SERVER, '')
+            supports_cors = hdrs.ACCESS_CONTROL_ALLOW_ORIGIN in h
 
             # Essayer de détecter le type d'API
-            content_type = response.headers.get('content-type', '').lower()
-            if 'json' in content_type:
-                api_info['type'] = 'REST/JSON'
-            elif 'xml' in content_type:
-                api_info['type'] = 'REST/XML'
-            elif 'graphql' in url.lower():
-                api_info['type'] = 'GraphQL'
+            ct_lower = ct.lower()
+            for substr, api_type in TYPE_BY_SUBSTR:
+                if substr in ct_lower:
+                    break
             else:
-                api_info['type'] = 'Unknown'
-
-            return api_info
-
-        except requests.RequestException as e:
-            return {
-                'url': url,
-                'status_code': 0,
-                'error': str(e),
-                'is_functional': False
-            }
+                api_type = 'GraphQL' if GRAPHQL_RE.search(url) else 'Unknown'
 
-    def search_github_apis(self, query="public api", max_results=50):
+            # Analyser la réponse
+            return ApiInfo(
+                url=url,
+                status_code=status,
+                content_type=ct,
+                server=srv,
+                is_functional=status < 400,
+                response_time=response_time,
+                supports_cors=supports_cors,
+                requires_auth=status == 401,
+                rate_limited=rate_limited,
+                type=api_type
+            )
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return ApiInfo(url=url, status_code=0, error=str(e))
+
+    async def _fetch_readme(self, session, sem, repo, timeout=10):
+        """Récupère le README brut d'un dépôt GitHub"""
+        readme_url = f"https://api.github.com/repos/{repo['full_name']}/readme"
+        async with sem:
+            async with session.get(
+                readme_url, headers=GITHUB_RAW_HEADERS, timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                if response.status != 200:
+                    return None
+                return await response.read()
+
+    async def search_github_apis(self, session, query="public api", max_results=50):
         """Recherche d'APIs sur GitHub"""
         github_api_url = f"https://api.github.com/search/repositories"
         params = {
@@ -150,129 +311,133 @@ class APICollector:
         }
 
         try:
-            response = self.session.get(github_api_url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                github_apis = []
-
-                for repo in data.get('items', []):
-                    # Extraire les URLs potentielles du README
-                    readme_url = f"https://api.github.com/repos/{repo['full_name']}/readme"
-                    readme_response = self.session.get(readme_url)
-
-                    if readme_response.status_code == 200:
-                        readme_data = readme_response.json()
-                        # Le contenu est en base64
-                        import base64
-                        content = base64.b64decode(readme_data['content']).decode('utf-8')
-
-                        # Extraire les URLs d'APIs
-                        for pattern in self.api_patterns:
-                            matches = re.findall(pattern, content, re.IGNORECASE)
-                            github_apis.extend(matches)
-
-                    time.sleep(0.1)  # Rate limiting pour GitHub API
-
-                return list(set(github_apis))
-
-        except requests.RequestException as e:
+            async with session.get(github_api_url, params=params) as response:
+                if response.status != 200:
+                    return set()
+                data = await response.json()
+
+            # Récupérer les README en parallèle (concurrence bornée pour GitHub)
+            repos = data.get('items', [])
+            sem = asyncio.Semaphore(GITHUB_CONCURRENCY)
+            readmes = await asyncio.gather(
+                *(self._fetch_readme(session, sem, repo) for repo in repos),
+                return_exceptions=True
+            )
+
+            # Extraire les URLs d'APIs
+            github_apis = set()
+            for repo, content in zip(repos, readmes):
+                if isinstance(content, BaseException):
+                    # Un README en échec ne bloque pas les autres, mais l'erreur reste visible
+                    logging.warning(f"Erreur lors de la récupération du README de {repo.get('full_name')}: {content!r}")
+                elif isinstance(content, bytes):
+                    # Seules les URLs trouvées (courtes) sont décodées
+                    github_apis.update(
+                        m.decode('utf-8', 'replace') for m in self._api_regex_bytes.findall(content)
+                    )
+
+            return github_apis
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logging.error(f"Erreur lors de la recherche GitHub: {e}")
-            return []
-
-    def collect_from_directories(self):
-        """Collecte des APIs depuis les répertoires connus"""
-        all_links = []
-
-        for directory in self.api_directories:
-            logging.info(f"Collecte depuis: {directory}")
-            content = self.get_page_content(directory)
+            return set()
 
-            if content:
-                links = self.extract_links_from_html(content, directory)
-                api_links = [link for link in links if self.is_api_url(link)]
-                all_links.extend(api_links)
+    async def _collect_from_directory(self, session, directory):
+        """Récupère un répertoire et en extrait les liens API"""
+        logging.info(f"Collecte depuis: {directory}")
+        content = await self.get_page_content(session, directory)
+        if not content:
+            return set()
 
-                logging.info(f"Trouvé {len(api_links)} liens API potentiels")
-
-            # Délai pour éviter d'être bloqué
-            time.sleep(random.uniform(1, 3))
+        # Le parsing (CPU) et le filtrage tournent dans un thread pendant que les autres pages se téléchargent
+        loop = asyncio.get_running_loop()
+        try:
+            api_links = await loop.run_in_executor(
+                None, lambda: set(self.extract_links_from_html(content, directory))
+            )
+        except Exception as e:
+            # Une page illisible ne doit pas faire perdre les liens des autres répertoires
+            logging.warning(f"Erreur lors de l'analyse de {directory}: {e}")
+            return set()
+
+        logging.info(f"Trouvé {len(api_links)} liens API potentiels sur {directory}")
+        return api_links
+
+    async def collect_from_directories(self, session):
+        """Collecte des APIs depuis les répertoires connus"""
+        # Chaque répertoire est sur un hôte différent : inutile d'espacer les requêtes
+        results = await asyncio.gather(
+            *(self._collect_from_directory(session, directory) for directory in self.api_directories)
+        )
 
-        return list(set(all_links))
+        return set().union(*results)
 
-    def test_apis_parallel(self, urls, max_workers=10):
-        """Teste les APIs en parallèle"""
+    async def test_apis(self, session, urls, max_concurrency=None, on_result=None):
+        """Teste les APIs en concurrence ; on_result reçoit chaque API fonctionnelle dès son test terminé"""
         functional_apis = []
-
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Soumettre toutes les tâches
-            future_to_url = {
-                executor.submit(self.test_api_endpoint, url): url
-                for url in urls
-            }
-
-            # Récupérer les résultats
-            for future in as_completed(future_to_url):
-                result = future.result()
-                if result.get('is_functional'):
+        url_iter = interleave_by_host(urls)
+        # Peu de tests simultanés par hôte pour éviter les 429 ; l'attente se fait ici,
+        # hors du ClientTimeout, pour qu'une URL en file ne soit pas déclarée morte
+        host_sems = defaultdict(lambda: asyncio.Semaphore(LIMIT_PER_HOST))
+
+        async def _worker():
+            # Chaque worker tire l'URL suivante : ni tâche ni future créée par URL
+            for url in url_iter:
+                try:
+                    async with host_sems[host_key(url)]:
+                        result = await self.test_api_endpoint(session, url)
+                except Exception as e:
+                    logging.warning(f"Erreur inattendue lors du test de {url}: {e}")
+                    continue
+                if result.is_functional:
                     functional_apis.append(result)
-                    logging.info(f"API fonctionnelle trouvée: {result['url']}")
-
-                # Petit délai pour éviter de surcharger
-                time.sleep(0.1)
+                    logging.info(f"API fonctionnelle trouvée: {result.url}")
+                    if on_result is not None:
+                        on_result(result)
 
+        await asyncio.gather(*(_worker() for _ in range(max_concurrency or self.max_concurrency)))
         return functional_apis
 
-    def save_results(self, apis, format='json'):
-        """Sauvegarde les résultats dans différents formats"""
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-
-        if format == 'json':
-            filename = f"apis_collected_{timestamp}.json"
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(apis, f, indent=2, ensure_ascii=False)
-
-        elif format == 'csv':
-            filename = f"apis_collected_{timestamp}.csv"
-            with open(filename, 'w', newline='', encoding='utf-8') as f:
-                if apis:
-                    fieldnames = apis[0].keys()
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(apis)
+    def test_apis_parallel(self, urls, max_concurrency=None):
+        """Teste les APIs en parallèle"""
+        async def _run():
+            async with self.create_session() as session:
+                return await self.test_apis(session, urls, max_concurrency)
 
-        logging.info(f"Résultats sauvegardés dans: {filename}")
-        return filename
+        return asyncio.run(_run())
 
     def run_collection(self):
         """Lance la collecte complète"""
-        logging.info("Début de la collecte d'APIs...")
+        return asyncio.run(self._run_collection())
 
-        # 1. Collecter depuis les répertoires
-        logging.info("Phase 1: Collecte depuis les répertoires d'APIs")
-        directory_apis = self.collect_from_directories()
+    async def _run_collection(self):
+        logging.info("Début de la collecte d'APIs...")
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
 
-        # 2. Recherche sur GitHub
-        logging.info("Phase 2: Recherche sur GitHub")
-        github_apis = self.search_github_apis()
+        async with self.create_session() as session:
+            # 1. Collecter depuis les répertoires
+            logging.info("Phase 1: Collecte depuis les répertoires d'APIs")
+            directory_apis = await self.collect_from_directories(session)
 
-        # 3. Combiner toutes les URLs
-        all_apis = list(set(directory_apis + github_apis))
-        logging.info(f"Total d'APIs collectées: {len(all_apis)}")
+            # 2. Recherche sur GitHub
+            logging.info("Phase 2: Recherche sur GitHub")
+            github_apis = await self.search_github_apis(session)
 
-        # 4. Tester les APIs
-        logging.info("Phase 3: Test des APIs")
-        functional_apis = self.test_apis_parallel(all_apis[:100])  # Limiter pour l'exemple
+            # 3. Combiner toutes les URLs
+            self.found_apis = set().union(directory_apis, github_apis)
+            logging.info(f"Total d'APIs collectées: {len(self.found_apis)}")
 
-        # 5. Filtrer les APIs vraiment fonctionnelles
-        working_apis = [api for api in functional_apis if api.get('is_functional')]
+            # 4. Tester les APIs, en sauvegardant chaque API fonctionnelle dès qu'elle est trouvée
+            logging.info("Phase 3: Test des APIs")
+            with ResultWriter(f"apis_collected_{timestamp}") as writer:
+                working_apis = await self.test_apis(
+                    session, islice(self.found_apis, 100), on_result=writer.write  # Limiter pour l'exemple
+                )
 
         logging.info(f"APIs fonctionnelles trouvées: {len(working_apis)}")
+        logging.info(f"Résultats sauvegardés dans: {writer.json_file}, {writer.csv_file}")
 
-        # 6. Sauvegarder les résultats
-        json_file = self.save_results(working_apis, 'json')
-        csv_file = self.save_results(working_apis, 'csv')
-
-        return working_apis, json_file, csv_file
+        return working_apis, writer.json_file, writer.csv_file
 
 
 def main():
@@ -287,7 +452,7 @@ def main():
         print(f"{'=' * 50}")
         print(f"APIs fonctionnelles trouvées: {len(working_apis)}")
         print(f"Fichiers générés:")
-        print(f"  - JSON: {json_file}")
+        print(f"  - JSONL: {json_file}")
         print(f"  - CSV: {csv_file}")
         print(f"{'=' * 50}")
 
@@ -295,7 +460,7 @@ def main():
         if working_apis:
             print(f"\nExemples d'APIs trouvées:")
             for i, api in enumerate(working_apis[:5]):
-                print(f"{i + 1}. {api['url']} (Status: {api['status_code']})")
+                print(f"{i + 1}. {api.url} (Status: {api.status_code})")
 
     except KeyboardInterrupt:
         logging.info("Collecte interrompue par l'utilisateur")